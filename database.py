@@ -3,15 +3,27 @@ Database Helper Functions
 
 MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
+
+The client is created by `connect_db()` from the FastAPI lifespan so a single
+Motor client (and its connection pool) is shared by every request.
 """
 
-from pymongo import MongoClient
+import asyncio
+import logging
+import msgspec
+from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
+from pymongo import InsertOne
+from pymongo.errors import PyMongoError
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import Dict, List, Union
 from pydantic import BaseModel
 
+# child of uvicorn's error logger, which uvicorn (and gunicorn's UvicornWorker) attach handlers to
+logger = logging.getLogger("uvicorn.error.database")
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -21,35 +33,187 @@ db = None
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
-if database_url and database_name:
-    _client = MongoClient(database_url)
-    db = _client[database_name]
+# Connection pool settings (per worker process). Sockets are opened once and reused,
+# so requests skip the TCP + auth handshake; minPoolSize keeps a few warm, and
+# maxPoolSize bounds concurrent operations before requests queue for a socket.
+POOL_SETTINGS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", 100)),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", 10)),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", 30000)),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 2000)),
+}
+
+def connect_db():
+    """Create the shared Motor client (call once on startup)"""
+    global _client, db
+    if database_url and database_name and _client is None:
+        _client = AsyncIOMotorClient(database_url, **POOL_SETTINGS)
+        db = _client[database_name]
+        logger.info("MongoDB client created for database %s with pool settings %s", database_name, POOL_SETTINGS)
+
+async def close_db():
+    """Flush buffered inserts and close the shared Motor client (call once on shutdown)"""
+    global _client, db
+    if _client is not None:
+        await _bulk_buffer.drain()
+        _client.close()
+    _client = None
+    db = None
+
+async def ensure_indexes(indexes):
+    """Create (collection_name, keys) indexes concurrently; existing ones are left untouched"""
+    if db is None:
+        return
+
+    async def create(collection_name, keys):
+        try:
+            await db[collection_name].create_index(keys)
+        except PyMongoError:
+            logger.exception("Could not create index %s on %s", keys, collection_name)
+
+    await asyncio.gather(*(create(collection_name, keys) for collection_name, keys in indexes))
+
+# Write-behind buffer for inserts
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.05  # seconds
+
+class BulkBuffer:
+    """Group single inserts per collection and write them with bulk_write.
+
+    A batch is flushed once it reaches `batch_size` documents or `flush_interval`
+    seconds after the first buffered insert, whichever comes first.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._ops: Dict[str, List[InsertOne]] = {}
+        self._timer = None
+        self._tasks = set()
+
+    def add(self, collection_name: str, doc: dict):
+        ops = self._ops.setdefault(collection_name, [])
+        ops.append(InsertOne(doc))
+        if len(ops) >= self.batch_size:
+            self._spawn(self._write(collection_name, self._ops.pop(collection_name)))
+        elif self._timer is None:
+            self._timer = self._spawn(self._flush_later())
+
+    async def flush(self, collection_name: str = None):
+        """Write out everything currently buffered, or just one collection's inserts"""
+        if collection_name is None:
+            pending, self._ops = self._ops, {}
+        else:
+            ops = self._ops.pop(collection_name, None)
+            pending = {collection_name: ops} if ops else {}
+        await asyncio.gather(*(self._write(name, ops) for name, ops in pending.items()))
+
+    async def drain(self):
+        """Flush and wait for in-flight batches"""
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _spawn(self, coro):
+        # keep a reference so pending batches are not garbage collected
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        self._timer = None
+        await self.flush()
+
+    async def _write(self, collection_name: str, ops: List[InsertOne]):
+        try:
+            await db[collection_name].bulk_write(ops, ordered=False)
+        except PyMongoError:
+            logger.exception("Bulk insert of %d documents into %s failed", len(ops), collection_name)
+
+_bulk_buffer = BulkBuffer()
 
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
-    """Insert a single document with timestamp"""
+async def create_document(collection_name: str, data: Union[BaseModel, msgspec.Struct, dict], sync: bool = False):
+    """Insert a single document with timestamp.
+
+    The id is generated client-side and the insert is buffered for a bulk write;
+    pass `sync=True` to wait for the insert to be acknowledged.
+    """
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
 
-    # Convert Pydantic model to dict if needed
+    # Convert Pydantic model / msgspec struct to dict if needed
     if isinstance(data, BaseModel):
         data_dict = data.model_dump()
+    elif isinstance(data, msgspec.Struct):
+        data_dict = msgspec.structs.asdict(data)
     else:
         data_dict = data.copy()
 
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
+    data_dict['_id'] = ObjectId()
 
-    result = db[collection_name].insert_one(data_dict)
-    return str(result.inserted_id)
+    if sync:
+        await db[collection_name].insert_one(data_dict)
+    else:
+        _bulk_buffer.add(collection_name, data_dict)
+    return str(data_dict['_id'])
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+def _find(collection_name: str, filter_dict: dict = None, limit: int = None, after_id: ObjectId = None,
+          projection: dict = None):
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
-    
-    cursor = db[collection_name].find(filter_dict or {})
+
+    filter_dict = filter_dict or {}
+    if after_id is not None:
+        filter_dict = {**filter_dict, "_id": {"$gt": after_id}}
+    cursor = db[collection_name].find(filter_dict, projection).sort("_id", 1)
     if limit:
         cursor = cursor.limit(limit)
-    
-    return list(cursor)
+    return cursor
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, after_id: ObjectId = None,
+                        projection: dict = None):
+    """Get documents from collection in _id order, optionally starting after `after_id`"""
+    cursor = _find(collection_name, filter_dict, limit, after_id, projection)
+    # stringify ObjectId once here so responses can be serialized directly
+    return [{**doc, "_id": str(doc["_id"])} for doc in await cursor.to_list(length=limit)]
+
+async def iter_documents(collection_name: str, filter_dict: dict = None, limit: int = None, after_id: ObjectId = None,
+                         projection: dict = None):
+    """Like get_documents, but yields documents as the cursor fetches them.
+
+    The first batch is fetched before returning, so connection and query errors
+    (e.g. an invalid projection) raise here rather than mid-stream.
+    """
+    cursor = _find(collection_name, filter_dict, limit, after_id, projection)
+    first = await anext(cursor, None)
+
+    async def stream():
+        doc = first
+        while doc is not None:
+            yield {**doc, "_id": str(doc["_id"])}
+            doc = await anext(cursor, None)
+
+    return stream()
+
+async def update_document(collection_name: str, filter_dict: dict, update_data: dict):
+    """Update a single document and bump its timestamp; returns the number of matched documents"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    # inserts buffered by this process must land first or the update could miss them
+    await _bulk_buffer.flush(collection_name)
+    update_data = {**update_data, 'updated_at': datetime.now(timezone.utc)}
+    result = await db[collection_name].update_one(filter_dict, {"$set": update_data})
+    return result.matched_count
+
+async def list_collections():
+    """List collection names in the configured database"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    return await db.list_collection_names()
@@ -0,0 +1,28 @@
+"""
+Gunicorn settings for production.
+
+Run with:  gunicorn -c gunicorn.conf.py main:app
+"""
+
+import os
+
+_cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# one worker per available core, each pinned to its own core (see pre_fork/post_fork)
+workers = int(os.getenv("WEB_CONCURRENCY", len(_cpus)))
+# import the app once in the master; each worker still opens its own Mongo client in the lifespan
+preload_app = True
+
+def pre_fork(server, worker):
+    # runs in the master: give the new worker the least-loaded allowed core, judged by the
+    # live workers, so a replacement worker takes over the core its predecessor left free
+    in_use = [getattr(w, "cpu", None) for w in server.WORKERS.values()]
+    worker.cpu = min(_cpus, key=in_use.count)
+
+def post_fork(server, worker):
+    # pin the worker to the core chosen in pre_fork for cache locality
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {worker.cpu})
+        server.log.info("Worker %s pinned to CPU %s", worker.pid, worker.cpu)
@@ -1,16 +1,57 @@
+import asyncio
+import inspect
+import logging
 import os
-from fastapi import FastAPI, HTTPException
+import re
+import secrets
+import time
+import msgspec
+import orjson
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Body, Depends, Header, Query, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.routing import APIRoute
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, EmailStr, TypeAdapter, ValidationError
 from typing import List, Optional
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import OperationFailure, PyMongoError, ServerSelectionTimeoutError
 
-from database import create_document, get_documents, db
+import database
+from database import create_document, iter_documents, update_document, list_collections
 from schemas import (
     Branch, Role, User, Program, BudgetItem, ProgramRequest, Approval,
-    Resource, Event, Report, Evaluation, Notification
+    Resource, Event, Report, Evaluation, Notification,
+    ApprovalStruct, ReportStruct
 )
 
-app = FastAPI(title="Unified Student Activities & Community Services Platform")
+logger = logging.getLogger("uvicorn.error.main")
+
+# pymongo hands back naive datetimes that are UTC; tag them as such on output
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC
+
+class APIResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # one Motor client per worker process, shared by all requests
+    database.connect_db()
+    # build indexes in the background so an unreachable Mongo cannot hold up startup
+    index_task = asyncio.create_task(database.ensure_indexes(INDEXES))
+    yield
+    index_task.cancel()
+    await database.close_db()
+
+app = FastAPI(
+    title="Unified Student Activities & Community Services Platform",
+    lifespan=lifespan,
+    default_response_class=APIResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,11 +62,27 @@ app.add_middleware(
 )
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Unified Platform Backend Running"}
 
+@app.get("/health")
+async def health():
+    # liveness probe: never touches the database
+    return {"ok": True}
+
+# Helper: collection names for /test, refreshed at most every COLLECTIONS_TTL seconds
+COLLECTIONS_TTL = 10
+_collections_cache = {"expires": 0.0, "names": []}
+
+async def cached_collections():
+    now = time.monotonic()
+    if now >= _collections_cache["expires"]:
+        _collections_cache["names"] = (await list_collections())[:20]
+        _collections_cache["expires"] = now + COLLECTIONS_TTL
+    return _collections_cache["names"]
+
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -34,173 +91,320 @@ def test_database():
         "connection_status": "Not Connected",
         "collections": []
     }
-    try:
-        if db is not None:
-            response["database"] = "✅ Available"
-            response["database_url"] = "✅ Set" if os.getenv("DATABASE_URL") else "❌ Not Set"
-            response["database_name"] = "✅ Set" if os.getenv("DATABASE_NAME") else "❌ Not Set"
-            response["connection_status"] = "Connected"
-            try:
-                response["collections"] = db.list_collection_names()[:20]
-                response["database"] = "✅ Connected & Working"
-            except Exception as e:
-                response["database"] = f"⚠️ Connected but Error: {str(e)[:80]}"
-        else:
-            response["database"] = "⚠️ Available but not initialized"
-    except Exception as e:
-        response["database"] = f"❌ Error: {str(e)[:100]}"
+    if database.db is not None:
+        response["database"] = "✅ Available"
+        response["database_url"] = "✅ Set" if os.getenv("DATABASE_URL") else "❌ Not Set"
+        response["database_name"] = "✅ Set" if os.getenv("DATABASE_NAME") else "❌ Not Set"
+        response["connection_status"] = "Connected"
+        try:
+            response["collections"] = await cached_collections()
+            response["database"] = "✅ Connected & Working"
+        except ServerSelectionTimeoutError:
+            response["database"] = "⚠️ Connected but Error: timeout"
+        except OperationFailure:
+            response["database"] = "⚠️ Connected but Error: auth_failed"
+        except PyMongoError:
+            response["database"] = "⚠️ Connected but Error: error"
+    else:
+        response["database"] = "⚠️ Available but not initialized"
     return response
 
-# Helper: collection name from model
-
-def coll(name: str) -> str:
-    return name.lower()
+# Collection names (lowercase of the model class name, see schemas.py)
+BRANCH_COLL = "branch"
+ROLE_COLL = "role"
+USER_COLL = "user"
+PROGRAM_REQUEST_COLL = "programrequest"
+APPROVAL_COLL = "approval"
+RESOURCE_COLL = "resource"
+EVENT_COLL = "event"
+REPORT_COLL = "report"
+EVALUATION_COLL = "evaluation"
+NOTIFICATION_COLL = "notification"
+
+# Program request listings return a fixed summary; filtered by status (and branch), they are
+# covered queries answered from these indexes without reading documents
+PROGRAM_REQUEST_LIST_FIELDS = {"_id": 1, "program_title": 1, "status": 1, "branch_code": 1}
+PROGRAM_REQUEST_INDEXES = [
+    [("status", 1), ("_id", 1), ("branch_code", 1), ("program_title", 1)],
+    [("status", 1), ("branch_code", 1), ("_id", 1), ("program_title", 1)],
+    [("branch_code", 1), ("_id", 1)],
+]
+
+# Indexes backing the filters of the list endpoints. Each filter field is followed by _id so
+# keyset pages (sorted by _id) are read in index order instead of sorted in memory; when two
+# filters are combined, one index drives the scan and the other field is checked per document.
+INDEXES = [
+    (USER_COLL, [("branch_code", 1), ("_id", 1)]),
+    *((PROGRAM_REQUEST_COLL, keys) for keys in PROGRAM_REQUEST_INDEXES),
+    (RESOURCE_COLL, [("branch_code", 1), ("_id", 1)]),
+    (RESOURCE_COLL, [("type", 1), ("_id", 1)]),
+    (EVENT_COLL, [("branch_code", 1), ("_id", 1)]),
+    (EVENT_COLL, [("status", 1), ("_id", 1)]),
+    (REPORT_COLL, [("request_id", 1), ("_id", 1)]),
+    (EVALUATION_COLL, [("request_id", 1), ("_id", 1)]),
+    (NOTIFICATION_COLL, [("user_email", 1), ("_id", 1)]),
+    (NOTIFICATION_COLL, [("branch_code", 1), ("_id", 1)]),
+]
+
+# Helper: keyset pagination for list endpoints
+async def pagination(limit: int = Query(50, ge=1, le=500), after_id: Optional[str] = None):
+    if after_id is None:
+        return {"limit": limit}
+    try:
+        return {"limit": limit, "after_id": ObjectId(after_id)}
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid after_id")
+
+def _valid_projection(names) -> bool:
+    # Mongo rejects operators ($...), empty path segments and a path next to its own parent
+    for name in names:
+        if any(not part or part.startswith("$") for part in name.split(".")):
+            return False
+    return not any(other.startswith(name + ".") for name in names for other in names)
+
+# Helper: optional field projection for list endpoints (`fields=a,b,c`)
+def projection(default: Optional[dict] = None):
+    async def parse(fields: Optional[str] = Query(None, description="Comma-separated fields to return, or * for all")):
+        if fields == "*":
+            return None
+        if fields:
+            names = {f.strip() for f in fields.split(",") if f.strip()}
+            if not _valid_projection(names):
+                raise HTTPException(status_code=400, detail="Invalid fields")
+            return {name: 1 for name in names}
+        return default
+
+    return parse
+
+# List views leave out bulky embedded data unless asked for
+REPORT_LIST_FIELDS = {"summary": 1, "attendees_count": 1, "request_id": 1}
+
+# Helper: OpenAPI requestBody for routes that read the raw body themselves
+def _inline_refs(node, defs):
+    if isinstance(node, dict):
+        if "$ref" in node:
+            return _inline_refs(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+        return {k: _inline_refs(v, defs) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_inline_refs(v, defs) for v in node]
+    return node
+
+def request_body(model):
+    schema = model.model_json_schema()
+    schema = _inline_refs(schema, schema.pop("$defs", {}))
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
+# Helper: Pydantic errors in the shape FastAPI produces for bound bodies
+def body_errors(e: ValidationError):
+    return [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+
+# Helper: msgspec decode errors in the same shape as body_errors
+_MSGSPEC_PATH_PART = re.compile(r"\.([^.\[]+)|\[(\d+)\]")
+_MSGSPEC_MISSING = re.compile(r"Object missing required field `(.+)`")
+
+def msgspec_errors(e: msgspec.DecodeError):
+    msg, loc = str(e), ("body",)
+    if not isinstance(e, msgspec.ValidationError):
+        return [{"type": "json_invalid", "loc": loc, "msg": msg}]
+    # msgspec reports the location as a JSON path suffix, e.g. "... - at `$.photos[1]`"
+    if " - at `$" in msg:
+        msg, path = msg.rsplit(" - at `$", 1)
+        loc += tuple(key or int(index) for key, index in _MSGSPEC_PATH_PART.findall(path.rstrip("`")))
+    missing = _MSGSPEC_MISSING.fullmatch(msg)
+    if missing:
+        return [{"type": "missing", "loc": (*loc, missing.group(1)), "msg": "Field required"}]
+    return [{"type": "value_error", "loc": loc, "msg": msg}]
+
+# Helper: decode a JSON body straight into a msgspec struct
+def msgspec_body(struct_type):
+    # strict=False gives the same lax coercion as Pydantic, e.g. "3" or 3.0 for an int field
+    decoder = msgspec.json.Decoder(struct_type, strict=False)
+
+    async def decode(request: Request):
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise RequestValidationError(msgspec_errors(e))
+
+    return decode
+
+def paginated(docs, limit: int):
+    # stream {"items": [...], "next": ...} document by document instead of building the page in memory;
+    # `docs` comes from iter_documents, which has already fetched the first batch
+    async def body():
+        yield b'{"items":['
+        count, last_id = 0, None
+        try:
+            async for doc in docs:
+                yield (b"," if count else b"") + orjson.dumps(doc, option=ORJSON_OPTIONS)
+                count, last_id = count + 1, doc["_id"]
+        except PyMongoError:
+            # the 200 status is already sent: close the envelope but flag the page as incomplete
+            logger.exception("List response aborted after %d documents", count)
+            yield b'],"next":null,"error":"database_error"}'
+            return
+        # a short page means there is nothing left to fetch
+        next_id = last_id if count == limit else None
+        yield b'],"next":' + orjson.dumps(next_id) + b"}"
+
+    return StreamingResponse(body(), media_type="application/json")
 
 # ------- Reference Data Endpoints -------
-@app.post("/branches")
-def create_branch(payload: Branch):
-    branch_id = create_document(coll("branch"), payload)
-    return {"id": branch_id, "message": "Branch created"}
+# Reference data is maintained by the admin tooling. Requests carrying the ADMIN_TOKEN in
+# X-Admin-Token are trusted and skip validation (model_construct); everyone else is validated.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
 
-@app.get("/branches")
-def list_branches():
-    return get_documents(coll("branch"))
+async def is_admin(x_admin_token: Optional[str] = Header(None)) -> bool:
+    return bool(ADMIN_TOKEN and x_admin_token) and secrets.compare_digest(x_admin_token, ADMIN_TOKEN)
 
-@app.post("/roles")
-def create_role(payload: Role):
-    role_id = create_document(coll("role"), payload)
-    return {"id": role_id}
+def reference_model(model, payload: dict, trusted: bool):
+    if trusted:
+        return model.model_construct(**payload)
+    try:
+        return model.model_validate(payload)
+    except ValidationError as e:
+        raise RequestValidationError(body_errors(e))
 
-@app.get("/roles")
+@app.post("/branches", openapi_extra=request_body(Branch))
+async def create_branch(payload: dict = Body(...), trusted: bool = Depends(is_admin), sync: bool = False):
+    branch_id = await create_document(BRANCH_COLL, reference_model(Branch, payload, trusted), sync=sync)
+    return APIResponse({"id": branch_id, "message": "Branch created"})
 
-def list_roles():
-    return get_documents(coll("role"))
+@app.get("/branches", response_model=None)
+async def list_branches(page: dict = Depends(pagination), fields: Optional[dict] = Depends(projection())):
+    return paginated(await iter_documents(BRANCH_COLL, projection=fields, **page), page["limit"])
 
-@app.post("/users")
+@app.post("/roles", openapi_extra=request_body(Role))
+async def create_role(payload: dict = Body(...), trusted: bool = Depends(is_admin), sync: bool = False):
+    role_id = await create_document(ROLE_COLL, reference_model(Role, payload, trusted), sync=sync)
+    return APIResponse({"id": role_id})
 
-def create_user(payload: User):
-    user_id = create_document(coll("user"), payload)
-    return {"id": user_id}
+@app.get("/roles", response_model=None)
+async def list_roles(page: dict = Depends(pagination), fields: Optional[dict] = Depends(projection())):
+    return paginated(await iter_documents(ROLE_COLL, projection=fields, **page), page["limit"])
 
-@app.get("/users")
+@app.post("/users")
+async def create_user(payload: User, sync: bool = False):
+    user_id = await create_document(USER_COLL, payload, sync=sync)
+    return APIResponse({"id": user_id})
 
-def list_users(branch_code: Optional[str] = None):
+@app.get("/users", response_model=None)
+async def list_users(branch_code: Optional[str] = None, page: dict = Depends(pagination), fields: Optional[dict] = Depends(projection())):
     q = {"branch_code": branch_code} if branch_code else {}
-    return get_documents(coll("user"), q)
+    return paginated(await iter_documents(USER_COLL, q, projection=fields, **page), page["limit"])
 
 # ------- Program Requests Lifecycle -------
-@app.post("/program-requests")
-
-def submit_program_request(payload: ProgramRequest):
-    req_id = create_document(coll("programrequest"), payload)
-    return {"id": req_id, "status": payload.status}
-
-@app.get("/program-requests")
-
-def list_program_requests(status: Optional[str] = None, branch_code: Optional[str] = None):
+@app.post("/program-requests", openapi_extra=request_body(ProgramRequest))
+async def submit_program_request(request: Request):
+    # parse and validate the raw body in one pass (jiter) instead of json.loads -> dict -> model
+    try:
+        payload = ProgramRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(body_errors(e))
+    # always written through: approvals (possibly on another worker) update this document right away
+    req_id = await create_document(PROGRAM_REQUEST_COLL, payload, sync=True)
+    return APIResponse({"id": req_id, "status": payload.status})
+
+@app.get("/program-requests", response_model=None)
+async def list_program_requests(status: Optional[str] = None, branch_code: Optional[str] = None, page: dict = Depends(pagination), fields: Optional[dict] = Depends(projection(PROGRAM_REQUEST_LIST_FIELDS))):
     q = {}
     if status:
         q["status"] = status
     if branch_code:
         q["branch_code"] = branch_code
-    return get_documents(coll("programrequest"), q)
+    return paginated(await iter_documents(PROGRAM_REQUEST_COLL, q, projection=fields, **page), page["limit"])
 
-@app.post("/approvals")
-
-def approve_request(payload: Approval):
+@app.post("/approvals", openapi_extra=request_body(Approval))
+async def approve_request(payload: ApprovalStruct = Depends(msgspec_body(ApprovalStruct)), sync: bool = False):
     # minimal append of approval history
-    if db is None:
+    if database.db is None:
         raise HTTPException(status_code=500, detail="Database not configured")
-    from bson import ObjectId
     approvals = {
         "request_id": payload.request_id,
         "approved_by": payload.approved_by,
         "decision": payload.decision,
         "notes": payload.notes,
     }
-    # store approval
-    approval_id = create_document(coll("approval"), approvals)
-    # update request status
-    db[coll("programrequest")].update_one(
-        {"_id": ObjectId(payload.request_id)},
-        {"$set": {"status": "approved" if payload.decision == "approved" else "rejected"}}
+    # update request status first, so an approval is only recorded for a request that exists
+    try:
+        request_oid = ObjectId(payload.request_id)
+    except InvalidId:
+        raise HTTPException(status_code=404, detail="Program request not found")
+    matched = await update_document(
+        PROGRAM_REQUEST_COLL,
+        {"_id": request_oid},
+        {"status": "approved" if payload.decision == "approved" else "rejected"}
     )
-    return {"id": approval_id}
+    if not matched:
+        raise HTTPException(status_code=404, detail="Program request not found")
+    # store approval
+    approval_id = await create_document(APPROVAL_COLL, approvals, sync=sync)
+    return APIResponse({"id": approval_id})
 
 # ------- Scheduling & Resources -------
-@app.post("/resources")
-
-def create_resource(payload: Resource):
-    res_id = create_document(coll("resource"), payload)
-    return {"id": res_id}
-
-@app.get("/resources")
+@app.post("/resources", openapi_extra=request_body(Resource))
+async def create_resource(payload: dict = Body(...), trusted: bool = Depends(is_admin), sync: bool = False):
+    res_id = await create_document(RESOURCE_COLL, reference_model(Resource, payload, trusted), sync=sync)
+    return APIResponse({"id": res_id})
 
-def list_resources(branch_code: Optional[str] = None, type: Optional[str] = None):
+@app.get("/resources", response_model=None)
+async def list_resources(branch_code: Optional[str] = None, type: Optional[str] = None, page: dict = Depends(pagination), fields: Optional[dict] = Depends(projection())):
     q = {}
     if branch_code:
         q["branch_code"] = branch_code
     if type:
         q["type"] = type
-    return get_documents(coll("resource"), q)
+    return paginated(await iter_documents(RESOURCE_COLL, q, projection=fields, **page), page["limit"])
 
 @app.post("/events")
+async def create_event(payload: Event, sync: bool = False):
+    event_id = await create_document(EVENT_COLL, payload, sync=sync)
+    return APIResponse({"id": event_id})
 
-def create_event(payload: Event):
-    event_id = create_document(coll("event"), payload)
-    return {"id": event_id}
-
-@app.get("/events")
-
-def list_events(branch_code: Optional[str] = None, status: Optional[str] = None):
+@app.get("/events", response_model=None)
+async def list_events(branch_code: Optional[str] = None, status: Optional[str] = None, page: dict = Depends(pagination), fields: Optional[dict] = Depends(projection())):
     q = {}
     if branch_code:
         q["branch_code"] = branch_code
     if status:
         q["status"] = status
-    return get_documents(coll("event"), q)
+    return paginated(await iter_documents(EVENT_COLL, q, projection=fields, **page), page["limit"])
 
 # ------- Execution, Reporting, and Evaluation -------
-@app.post("/reports")
-
-def submit_report(payload: Report):
-    rep_id = create_document(coll("report"), payload)
-    return {"id": rep_id}
-
-@app.get("/reports")
+@app.post("/reports", openapi_extra=request_body(Report))
+async def submit_report(payload: ReportStruct = Depends(msgspec_body(ReportStruct)), sync: bool = False):
+    rep_id = await create_document(REPORT_COLL, payload, sync=sync)
+    return APIResponse({"id": rep_id})
 
-def list_reports(request_id: Optional[str] = None):
+@app.get("/reports", response_model=None)
+async def list_reports(request_id: Optional[str] = None, page: dict = Depends(pagination), fields: Optional[dict] = Depends(projection(REPORT_LIST_FIELDS))):
     q = {"request_id": request_id} if request_id else {}
-    return get_documents(coll("report"), q)
+    return paginated(await iter_documents(REPORT_COLL, q, projection=fields, **page), page["limit"])
 
 @app.post("/evaluations")
+async def submit_evaluation(payload: Evaluation, sync: bool = False):
+    ev_id = await create_document(EVALUATION_COLL, payload, sync=sync)
+    return APIResponse({"id": ev_id})
 
-def submit_evaluation(payload: Evaluation):
-    ev_id = create_document(coll("evaluation"), payload)
-    return {"id": ev_id}
-
-@app.get("/evaluations")
-
-def list_evaluations(request_id: Optional[str] = None):
+@app.get("/evaluations", response_model=None)
+async def list_evaluations(request_id: Optional[str] = None, page: dict = Depends(pagination), fields: Optional[dict] = Depends(projection())):
     q = {"request_id": request_id} if request_id else {}
-    return get_documents(coll("evaluation"), q)
+    return paginated(await iter_documents(EVALUATION_COLL, q, projection=fields, **page), page["limit"])
 
 # ------- Notifications -------
 @app.post("/notifications")
+async def create_notification(payload: Notification, sync: bool = False):
+    n_id = await create_document(NOTIFICATION_COLL, payload, sync=sync)
+    return APIResponse({"id": n_id})
 
-def create_notification(payload: Notification):
-    n_id = create_document(coll("notification"), payload)
-    return {"id": n_id}
-
-@app.get("/notifications")
-
-def list_notifications(user_email: Optional[str] = None, branch_code: Optional[str] = None):
+@app.get("/notifications", response_model=None)
+async def list_notifications(user_email: Optional[str] = None, branch_code: Optional[str] = None, page: dict = Depends(pagination), fields: Optional[dict] = Depends(projection())):
     q = {}
     if user_email:
         q["user_email"] = user_email
     if branch_code:
         q["branch_code"] = branch_code
-    return get_documents(coll("notification"), q)
+    return paginated(await iter_documents(NOTIFICATION_COLL, q, projection=fields, **page), page["limit"])
 
 # ------- Schema Introspection (for admin tooling) -------
 class SchemaField(BaseModel):
@@ -211,18 +415,49 @@ class SchemaModel(BaseModel):
     name: str
     fields: List[SchemaField]
 
-@app.get("/schema")
+SCHEMA_MODELS = [Branch, Role, User, Program, BudgetItem, ProgramRequest, Approval, Resource, Event, Report, Evaluation, Notification]
 
-def get_schema():
-    # very lightweight reflection for admin tooling
-    models = [Branch, Role, User, Program, BudgetItem, ProgramRequest, Approval, Resource, Event, Report, Evaluation, Notification]
-    out = []
-    for m in models:
-        fields = [SchemaField(name=k, type=str(v.annotation)).model_dump() for k, v in m.model_fields.items()]
-        out.append(SchemaModel(name=m.__name__.lower(), fields=fields).model_dump())
-    return out
+_TYPE_NAMES = {str: "str", int: "int", float: "float", bool: "bool", datetime: "datetime", EmailStr: "EmailStr"}
+
+def _type_name(annotation) -> str:
+    # plain classes get their bare name; typing constructs (Optional[...], Literal[...]) keep their repr
+    name = _TYPE_NAMES.get(annotation)
+    if name is None:
+        name = annotation.__name__ if isinstance(annotation, type) else str(annotation)
+    return name
+
+# very lightweight reflection for admin tooling; models are static, so serialize it once at import
+_SCHEMA_CACHE = TypeAdapter(List[SchemaModel]).dump_json([
+    SchemaModel(
+        name=m.__name__.lower(),
+        fields=[SchemaField(name=k, type=_type_name(v.annotation)) for k, v in m.model_fields.items()],
+    )
+    for m in SCHEMA_MODELS
+])
+
+@app.get("/schema", response_model=None)
+async def get_schema():
+    return Response(_SCHEMA_CACHE, media_type="application/json")
+
+# Every handler and dependency must be a coroutine: FastAPI runs a plain `def` in the
+# threadpool (40 threads by default), which would cap concurrency again.
+def _sync_callables(dependant):
+    for sub in dependant.dependencies:
+        yield from _sync_callables(sub)
+    if dependant.call is not None and not inspect.iscoroutinefunction(dependant.call):
+        yield dependant.call
+
+_sync_endpoints = sorted({
+    call.__name__
+    for route in app.routes if isinstance(route, APIRoute)
+    for call in _sync_callables(route.dependant)
+})
+if _sync_endpoints:
+    raise RuntimeError(f"Synchronous handlers/dependencies would run in the threadpool: {', '.join(_sync_endpoints)}")
 
 if __name__ == "__main__":
+    # single-process server for local development; production runs
+    # `gunicorn -c gunicorn.conf.py main:app` (one uvicorn worker per core)
     import uvicorn
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(app, host="0.0.0.0", port=port)
@@ -8,8 +8,9 @@ These models validate incoming/outgoing payloads and serve as the single source
 for data across the platform.
 """
 
+import msgspec
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List, Literal
+from typing import Annotated, Optional, List, Literal
 from datetime import datetime
 
 # Core reference data
@@ -109,3 +110,21 @@ class Notification(BaseModel):
     message: str
     type: Literal["info", "success", "warning", "error"] = "info"
     is_read: bool = False
+
+# msgspec mirrors for write-heavy routes
+# Same fields and constraints as the Pydantic models above, decoded straight from the
+# request body by msgspec. The Pydantic models remain the source of truth for /schema
+# and for payloads that need EmailStr.
+class ApprovalStruct(msgspec.Struct):
+    request_id: str
+    approved_by: str
+    decision: Literal["approved", "rejected"]
+    notes: Optional[str] = None
+
+class ReportStruct(msgspec.Struct, kw_only=True):
+    request_id: Optional[str] = None
+    event_id: Optional[str] = None
+    submitted_by: Optional[str] = None
+    summary: str
+    attendees_count: Optional[Annotated[int, msgspec.Meta(ge=0)]] = None
+    photos: List[str] = []